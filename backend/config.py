@@ -24,6 +24,10 @@ class Settings(BaseSettings):
     vlm_model: str = "llama3.2-vision:11b"
     # Text model for prompt generation (faster, no vision needed)
     text_model: str = "llama3.2:3b"
+    # How long Ollama keeps a model loaded after a request (Ollama duration, e.g. "30m").
+    # Unset leaves it to the Ollama server's own OLLAMA_KEEP_ALIVE (5m by default), which
+    # training loops can outlast while ComfyUI renders between VLM calls.
+    ollama_keep_alive: str | None = None
 
     def ensure_outputs_dir(self) -> Path:
         self.outputs_dir.mkdir(parents=True, exist_ok=True)
@@ -76,6 +76,8 @@ async def lifespan(app: FastAPI):
     logger.info("Startup complete")
     yield
     logger.info("Shutting down...")
+    await vlm_service.close()
+    await comfyui_service.close()
 
 
 app = FastAPI(
@@ -310,6 +310,49 @@ class PromptWriteRequest(BaseModel):
     )
 
 
+class PromptBreakdownLighting(BaseModel):
+    model_config = {"frozen": True}
+
+    type: str
+    shadows: str
+    highlights: str
+
+
+class PromptBreakdownTexture(BaseModel):
+    model_config = {"frozen": True}
+
+    surface: str
+    noise: str
+    effects: list[str]
+
+
+class PromptBreakdownComposition(BaseModel):
+    model_config = {"frozen": True}
+
+    camera: str
+    framing: str
+    negative_space: str
+
+
+class PromptBreakdown(BaseModel):
+    """How a written prompt was constructed (subject + style components)."""
+    model_config = {"frozen": True}
+
+    subject: str
+    additional_context: str | None = None
+    technique: list[str] = Field(default=[])
+    palette: list[str] = Field(default=[])
+    lighting: PromptBreakdownLighting
+    texture: PromptBreakdownTexture
+    composition: PromptBreakdownComposition
+    mood: list[str] = Field(default=[])
+    core_invariants: list[str] = Field(default=[])
+    always_include: list[str] = Field(default=[])
+    always_avoid: list[str] = Field(default=[])
+    emphasize: list[str] = Field(default=[])
+    de_emphasize: list[str] = Field(default=[])
+
+
 class PromptWriteResponse(BaseModel):
     """Response with styled prompt."""
     subject: str = Field(description="The subject (returned separately)")
@@ -318,7 +361,7 @@ class PromptWriteResponse(BaseModel):
     negative_prompt: str | None = Field(description="Negative prompt if requested")
     style_name: str = Field(description="Name of the style used")
     # Optional: breakdown of how the prompt was constructed
-    prompt_breakdown: dict | None = Field(
+    prompt_breakdown: PromptBreakdown | None = Field(
         default=None,
         description="Breakdown showing subject + style components"
     )
@@ -24,7 +24,6 @@ from backend.services.comfyui import comfyui_service
 from backend.services.vlm import vlm_service
 from backend.services.critic import style_critic
 from backend.services.auto_improver import auto_improver
-from backend.services.training_debugger import training_debugger
 from backend.websocket import manager
 
 logger = logging.getLogger(__name__)
@@ -149,7 +149,7 @@ async def delete_session(
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Delete files
-    storage_service.delete_session(session_id)
+    await storage_service.delete_session(session_id)
 
     # Delete from database
     await db.delete(session)
@@ -169,7 +169,7 @@ async def delete_all_sessions(db: AsyncSession = Depends(get_db)):
     for session in sessions:
         try:
             # Delete files
-            storage_service.delete_session(session.id)
+            await storage_service.delete_session(session.id)
             # Delete from database
             await db.delete(session)
             deleted_count += 1
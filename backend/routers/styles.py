@@ -709,6 +709,7 @@ async def write_and_generate(
         include_negative=True,
         variation_level=data.variation_level,
         use_creative_rewrite=data.use_creative_rewrite,
+        include_breakdown=False,  # Only the prompts are used below
     )
 
     # Generate the image
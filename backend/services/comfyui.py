@@ -17,6 +17,19 @@ class ComfyUIService:
         self.client_id = str(uuid.uuid4())
         self._active_requests: dict[str, str] = {}  # request_id -> prompt_id mapping
         self._cancel_flags: dict[str, bool] = {}  # request_id -> cancelled flag
+        self._client: httpx.AsyncClient | None = None  # Shared client for short control/status calls
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client for status and control calls, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=10.0)
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _get_default_workflow(self, prompt: str, seed: int | None = None, negative_prompt: str | None = None) -> dict:
         """
@@ -115,14 +128,14 @@ class ComfyUIService:
     async def interrupt_generation(self):
         """Send interrupt signal to ComfyUI to stop current generation."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(f"{self.base_url}/interrupt")
-                if response.status_code == 200:
-                    logger.info("ComfyUI: Sent interrupt signal")
-                    return True
-                else:
-                    logger.warning(f"ComfyUI: Interrupt failed with status {response.status_code}")
-                    return False
+            client = await self._get_client()
+            response = await client.post("/interrupt", timeout=5.0)
+            if response.status_code == 200:
+                logger.info("ComfyUI: Sent interrupt signal")
+                return True
+            else:
+                logger.warning(f"ComfyUI: Interrupt failed with status {response.status_code}")
+                return False
         except Exception as e:
             logger.error(f"ComfyUI: Failed to send interrupt: {e}")
             return False
@@ -305,9 +318,9 @@ class ComfyUIService:
     async def health_check(self) -> bool:
         """Check if ComfyUI is available."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/system_stats")
-                return response.status_code == 200
+            client = await self._get_client()
+            response = await client.get("/system_stats")
+            return response.status_code == 200
         except Exception as e:
             logger.warning(f"ComfyUI health check failed: {e}")
             return False
@@ -315,15 +328,13 @@ class ComfyUIService:
     async def get_models(self) -> list[str]:
         """Get available checkpoint models."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/object_info/CheckpointLoaderSimple"
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("CheckpointLoaderSimple", {}).get(
-                        "input", {}
-                    ).get("required", {}).get("ckpt_name", [[]])[0]
+            client = await self._get_client()
+            response = await client.get("/object_info/CheckpointLoaderSimple")
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("CheckpointLoaderSimple", {}).get(
+                    "input", {}
+                ).get("required", {}).get("ckpt_name", [[]])[0]
         except Exception as e:
             logger.warning(f"Failed to get models: {e}")
         return []
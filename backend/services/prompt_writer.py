@@ -3,56 +3,119 @@ Prompt Writer Service
 
 Takes a trained style and a subject, produces a styled prompt ready for image generation.
 """
+import functools
+import itertools
 import logging
 import random
+from collections import Counter, defaultdict
 from pathlib import Path
-
-from backend.models.schemas import StyleProfile, StyleRules, PromptWriteResponse
+from typing import ClassVar
+
+from backend.models.schemas import (
+    StyleProfile,
+    StyleRules,
+    PaletteSchema,
+    LightingSchema,
+    PromptWriteResponse,
+    PromptBreakdown,
+    PromptBreakdownLighting,
+    PromptBreakdownTexture,
+    PromptBreakdownComposition,
+)
 from backend.services.vlm import vlm_service
 
 logger = logging.getLogger(__name__)
 
 
+_QUALITY_NEGATIVES = ("blurry", "low quality", "distorted", "deformed")
+
+# (keyword, phrase) pairs checked in order; the first keyword found wins
+_FRAMING_RULES = (
+    ("center", "The composition places the subject centrally in the frame"),
+    ("thirds", "The composition follows the rule of thirds"),
+    ("asymmetric", "The composition uses asymmetric framing"),
+)
+_CAMERA_RULES = (
+    ("eye level", "at eye level perspective"),
+    ("low", "from a low angle perspective"),
+    ("high", "from an elevated perspective"),
+    ("bird", "from an elevated perspective"),
+)
+
+# Keywords that indicate subject-specific descriptions (not style)
+_SUBJECT_KEYWORDS = (
+    "cat", "dog", "person", "human", "animal", "bird", "fish",
+    "facing", "centered", "standing", "sitting", "lying",
+    "positioned", "placed", "located", "foreground", "background",
+    "subject", "figure", "character", "creature",
+    "left", "right", "front", "back", "side view",
+)
+# Emphasis items are also filtered for facial/expression details
+_EMPHASIS_SUBJECT_KEYWORDS = _SUBJECT_KEYWORDS + ("expression", "face", "eyes", "gaze", "look")
+
+# Emphasis added for score dimensions that were consistently weak during training
+_DIM_EMPHASIS = {
+    "palette": "maintain exact color palette",
+    "lighting": "preserve lighting style",
+    "texture": "maintain texture quality",
+    "composition": "follow composition guidelines",
+    "line_quality": "maintain line quality",
+}
+
+# Default style names that aren't worth mentioning in the prompt
+_GENERIC_STYLE_NAMES = frozenset({"extracted style", "unnamed style"})
+
+_PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+@functools.cache
+def _load_template(path: Path) -> str:
+    """Read a prompt template once per process."""
+    return path.read_text()
+
+
+def _push_sentence(sentences: list[str], sentence: str):
+    """Append a sentence stripped of whitespace, skipping empty ones."""
+    sentence = sentence.strip()
+    if sentence:
+        sentences.append(sentence)
+
+
 class PromptWriter:
-    def __init__(self):
-        self.prompt_template_path = Path(__file__).parent.parent / "prompts" / "prompt_writer.md"
-        self.style_guided_prompt_path = Path(__file__).parent.parent / "prompts" / "style_guided_writer.md"
+    prompt_template_path: ClassVar[Path] = _PROMPTS_DIR / "prompt_writer.md"
+    style_guided_prompt_path: ClassVar[Path] = _PROMPTS_DIR / "style_guided_writer.md"
+    _rng: ClassVar[random.Random] = random.Random()
 
     def _select_item(self, items: list, variation_level: int, index: int = 0):
         """Select item from list with variation. Higher variation = more random."""
         if not items:
             return None
-        if variation_level == 0:
-            # Deterministic - always use specified index
+        if variation_level == 0 or (variation_level < 50 and self._rng.random() >= variation_level / 100):
+            # Deterministic (or low variation that kept its place) - use specified index
             return items[index] if index < len(items) else items[0]
-        elif variation_level < 50:
-            # Low variation - slight shuffle, prefer earlier items
-            if random.random() < (variation_level / 100):
-                return random.choice(items[:min(3, len(items))])
-            return items[index] if index < len(items) else items[0]
-        else:
-            # High variation - random selection from all items
-            return random.choice(items)
+        # Low variation prefers earlier items, high variation picks from all
+        pool = items[:3] if variation_level < 50 else items
+        return self._rng.choice(pool)
 
     def _select_items(self, items: list, count: int, variation_level: int):
         """Select multiple items with variation."""
         if not items:
             return []
+        n = min(count, len(items))
         if variation_level == 0:
             # Deterministic - first N items
-            return items[:count]
-        elif variation_level < 50:
+            return items[:n]
+        if variation_level < 50 and self._rng.random() >= variation_level / 100:
             # Low variation - mostly first items, occasional shuffle
-            if random.random() < (variation_level / 100):
-                shuffled = items.copy()
-                random.shuffle(shuffled)
-                return shuffled[:count]
-            return items[:count]
-        else:
-            # High variation - random selection
-            available = items.copy()
-            random.shuffle(available)
-            return available[:min(count, len(available))]
+            return items[:n]
+        if n == 1:
+            return [self._rng.choice(items)]
+        # Random selection - partial Fisher-Yates, only the first n positions are shuffled
+        result = list(items)
+        for i in range(n):
+            j = self._rng.randrange(i, len(result))
+            result[i], result[j] = result[j], result[i]
+        return result[:n]
 
     def _vary_phrasing(self, options: list[str], variation_level: int) -> str:
         """Choose from phrasing options based on variation level."""
@@ -60,10 +123,10 @@ class PromptWriter:
             return options[0] if options else ""
         if variation_level < 50:
             # Low variation - prefer first option
-            return options[0] if random.random() > 0.3 else random.choice(options)
+            return options[0] if self._rng.random() > 0.3 else self._rng.choice(options)
         else:
             # High variation - random choice
-            return random.choice(options)
+            return self._rng.choice(options)
 
     async def _creative_rewrite(
         self,
@@ -79,7 +142,7 @@ class PromptWriter:
         integrate the style into the description naturally.
         """
         # Load system prompt
-        system_prompt = self.style_guided_prompt_path.read_text()
+        system_prompt = _load_template(self.style_guided_prompt_path)
 
         # Build comprehensive style rules context for the LLM
         # NOTE: Creative rewriting needs ALL constraints, not subset
@@ -101,15 +164,9 @@ class PromptWriter:
 
         # Filter core invariants to remove subject-specific ones
         style_invariants = []
-        subject_keywords = [
-            "cat", "dog", "person", "human", "animal", "bird", "fish",
-            "facing", "centered", "standing", "sitting", "lying",
-            "positioned", "placed", "located", "foreground", "background",
-            "subject", "figure", "character", "creature",
-            "left", "right", "front", "back", "side view"
-        ]
         for invariant in style_profile.core_invariants:
-            if not any(keyword in invariant.lower() for keyword in subject_keywords):
+            invariant_lower = invariant.lower()
+            if not any(keyword in invariant_lower for keyword in _SUBJECT_KEYWORDS):
                 style_invariants.append(invariant)
 
         # Build comprehensive style rules for VLM
@@ -240,8 +297,9 @@ Write a single flowing description that embodies ALL the above style rules."""
                 "Response:",
                 "Result:",
             ]
+            styled_prompt_lower = styled_prompt.lower()
             for phrase in intro_phrases:
-                if styled_prompt.lower().startswith(phrase.lower()):
+                if styled_prompt_lower.startswith(phrase.lower()):
                     styled_prompt = styled_prompt[len(phrase):].strip()
                     break
 
@@ -284,103 +342,34 @@ Write a single flowing description that embodies ALL the above style rules."""
             logger.warning("Falling back to mechanical prompt assembly")
             return None
 
-    def _mechanical_assembly(
-        self,
-        style_profile: StyleProfile,
-        style_rules: StyleRules,
-        additional_context: str | None = None,
-        variation_level: int = 0,
-    ) -> str:
-        """
-        Mechanical assembly of style traits into a prompt.
-
-        This is the fallback method when LLM-based creative rewriting fails.
-        Builds a prompt by sequentially listing style attributes.
-        """
-        palette = style_profile.palette
-        lighting = style_profile.lighting
-        texture = style_profile.texture
-        line_shape = style_profile.line_and_shape
-        composition = style_profile.composition
-
-        # Build prompt as natural flowing sentences
-        # NOTE: Subject is NOT included - only style information
-        sentences = []
-
-        # === SENTENCE 1: Style Technique ===
-        opening_parts = []
-
-        # Add primary technique - use variation to select
-        if style_rules.technique_keywords and len(style_rules.technique_keywords) > 0:
-            technique = self._select_item(style_rules.technique_keywords, variation_level, index=0)
-            # Vary phrasing
-            phrasing = self._vary_phrasing([
-                f"Rendered in {technique}",
-                f"Created in {technique}",
-                f"Styled as {technique}",
-                f"{technique.capitalize()}"
-            ], variation_level)
-            opening_parts.append(phrasing)
-        elif texture.surface:
-            # Fallback to texture description as technique
-            opening_parts.append(f"Created with {texture.surface}")
-
-        # Add style name if meaningful
-        if style_profile.style_name and style_profile.style_name.lower() not in ["extracted style", "unnamed style"]:
-            opening_parts.append(f"{style_profile.style_name} style")
-
-        if opening_parts:
-            sentences.append(". ".join(opening_parts))
-
-        # === SENTENCE 2: Color Palette ===
-        if palette.color_descriptions and len(palette.color_descriptions) > 0:
-            # Use variation to select colors (3-5 colors)
-            color_count = 4 if variation_level < 50 else random.randint(3, min(5, len(palette.color_descriptions)))
-            colors = self._select_items(palette.color_descriptions, color_count, variation_level)
-
-            # Build natural color description with varied phrasing
-            if len(colors) == 1:
-                color_desc = self._vary_phrasing([
-                    f"The color palette features {colors[0]}",
-                    f"Dominated by {colors[0]} tones",
-                    f"Features {colors[0]}"
-                ], variation_level)
-            elif len(colors) == 2:
-                color_desc = self._vary_phrasing([
-                    f"The scene features {colors[0]} and {colors[1]} tones",
-                    f"Combines {colors[0]} with {colors[1]}",
-                    f"Features {colors[0]} and {colors[1]} hues"
-                ], variation_level)
-            elif len(colors) >= 3:
-                main_colors = ", ".join(colors[:-1])
-                color_desc = self._vary_phrasing([
-                    f"The composition uses {main_colors}, and {colors[-1]} tones",
-                    f"Features a palette of {main_colors}, and {colors[-1]}",
-                    f"Combines {main_colors} with {colors[-1]} accents"
-                ], variation_level)
-
-            # Add accent colors if available
-            if palette.accents and len(palette.accents) > 0:
-                accent_names = palette.color_descriptions[len(palette.dominant_colors):len(palette.dominant_colors) + 2]
-                if accent_names:
-                    if len(accent_names) == 1:
-                        color_desc += f" with {accent_names[0]} accents"
-                    else:
-                        color_desc += f" with {' and '.join(accent_names)} accents"
-
-            # Add saturation level
-            if palette.saturation:
-                sat = palette.saturation.lower()
-                if "high" in sat or "vivid" in sat:
-                    color_desc += ", creating a vibrant appearance"
-                elif "low" in sat or "muted" in sat:
-                    color_desc += ", creating a muted and subtle appearance"
-                elif "medium" in sat:
-                    color_desc += " with balanced saturation"
-
-            sentences.append(color_desc)
-
-        # === SENTENCE 3: Lighting + Atmosphere ===
+    def _color_details(self, palette: PaletteSchema) -> str:
+        """Accent and saturation phrasing appended to the color sentence."""
+        details = []
+
+        # Add accent colors if available (named after the dominant colors)
+        if palette.accents:
+            dom_n = len(palette.dominant_colors) if palette.dominant_colors else 0
+            accent_names = (palette.color_descriptions or [])[dom_n:dom_n + 2]
+            if accent_names:
+                if len(accent_names) == 1:
+                    details.append(f" with {accent_names[0]} accents")
+                else:
+                    details.append(f" with {' and '.join(accent_names)} accents")
+
+        # Add saturation level
+        if palette.saturation:
+            sat = palette.saturation.lower()
+            if "high" in sat or "vivid" in sat:
+                details.append(", creating a vibrant appearance")
+            elif "low" in sat or "muted" in sat:
+                details.append(", creating a muted and subtle appearance")
+            elif "medium" in sat:
+                details.append(" with balanced saturation")
+
+        return "".join(details)
+
+    def _lighting_parts(self, lighting: LightingSchema) -> list[str]:
+        """Lighting type, shadows and highlights phrasing for the lighting sentence."""
         lighting_parts = []
 
         if lighting.lighting_type:
@@ -407,26 +396,21 @@ Write a single flowing description that embodies ALL the above style rules."""
             else:
                 lighting_parts.append(f"The scene features {highlights}")
 
-        # Add mood keywords - use variation to select
-        if style_rules.mood_keywords and len(style_rules.mood_keywords) > 0:
-            mood = self._select_item(style_rules.mood_keywords, variation_level, index=0)
-            if lighting_parts:
-                mood_phrase = self._vary_phrasing([
-                    f"creating {mood}",
-                    f"evoking {mood}",
-                    f"with {mood}"
-                ], variation_level)
-                lighting_parts.append(mood_phrase)
-            else:
-                mood_phrase = self._vary_phrasing([
-                    f"The atmosphere features {mood}",
-                    f"Atmosphere: {mood}",
-                    f"{mood.capitalize()} mood"
-                ], variation_level)
-                lighting_parts.append(mood_phrase)
+        return lighting_parts
 
-        if lighting_parts:
-            sentences.append(", ".join(lighting_parts))
+    def _assemble_structure(
+        self,
+        sentences: list[str],
+        style_profile: StyleProfile,
+        style_rules: StyleRules,
+    ):
+        """Append the texture, form, composition, invariant and emphasis sentences.
+
+        None of these depend on variation_level, so both assembly paths share them.
+        """
+        texture = style_profile.texture
+        line_shape = style_profile.line_and_shape
+        composition = style_profile.composition
 
         # === SENTENCE 4: Texture + Surface Quality ===
         texture_parts = []
@@ -437,20 +421,22 @@ Write a single flowing description that embodies ALL the above style rules."""
 
         # Add technique details
         if style_rules.technique_keywords and len(style_rules.technique_keywords) > 1:
+            surface_lower = texture.surface.lower()
             for technique in style_rules.technique_keywords[1:3]:
-                if technique.lower() not in texture.surface.lower():  # Avoid repetition
+                if technique.lower() not in surface_lower:  # Avoid repetition
                     texture_parts.append(technique)
 
         # Add special effects
-        if texture.special_effects and len(texture.special_effects) > 0:
+        if texture.special_effects:
             effects_str = " and ".join(texture.special_effects[:2])
             texture_parts.append(effects_str)
 
         if texture_parts:
-            texture_sentence = " with ".join(texture_parts[:2])
+            texture_sentence = [" with ".join(texture_parts[:2])]
             if len(texture_parts) > 2:
-                texture_sentence += f", featuring {', '.join(texture_parts[2:])}"
-            sentences.append(texture_sentence + " throughout")
+                texture_sentence.append(f", featuring {', '.join(texture_parts[2:])}")
+            texture_sentence.append(" throughout")
+            _push_sentence(sentences, "".join(texture_sentence))
 
         # === SENTENCE 5: Line Quality + Shape Language ===
         form_parts = []
@@ -460,66 +446,50 @@ Write a single flowing description that embodies ALL the above style rules."""
 
         if line_shape.shape_language:
             shape_desc = line_shape.shape_language
-            if "organic" in shape_desc.lower():
+            shape_lower = shape_desc.lower()
+            if "organic" in shape_lower:
                 form_parts.append("flowing organic forms")
-            elif "geometric" in shape_desc.lower():
+            elif "geometric" in shape_lower:
                 form_parts.append("geometric shapes")
-            elif "angular" in shape_desc.lower():
+            elif "angular" in shape_lower:
                 form_parts.append("angular forms")
             else:
                 form_parts.append(f"{shape_desc} shapes")
 
         if form_parts:
-            sentences.append(" and ".join(form_parts) + " define the visual structure")
+            _push_sentence(sentences, " and ".join(form_parts) + " define the visual structure")
 
         # === SENTENCE 6: Composition + Framing ===
         comp_parts = []
 
         if composition.framing:
             framing = composition.framing.lower()
-            if "center" in framing:
-                comp_parts.append("The composition places the subject centrally in the frame")
-            elif "rule of thirds" in framing or "thirds" in framing:
-                comp_parts.append("The composition follows the rule of thirds")
-            elif "asymmetric" in framing:
-                comp_parts.append("The composition uses asymmetric framing")
-            else:
-                comp_parts.append(f"The composition uses {composition.framing}")
+            comp_parts.append(next(
+                (phrase for keyword, phrase in _FRAMING_RULES if keyword in framing),
+                f"The composition uses {composition.framing}",
+            ))
 
         if composition.camera:
             camera = composition.camera.lower()
-            if "eye level" in camera:
-                comp_parts.append("at eye level perspective")
-            elif "low" in camera:
-                comp_parts.append("from a low angle perspective")
-            elif "high" in camera or "bird" in camera:
-                comp_parts.append("from an elevated perspective")
-            else:
-                comp_parts.append(f"with {composition.camera} camera angle")
+            comp_parts.append(next(
+                (phrase for keyword, phrase in _CAMERA_RULES if keyword in camera),
+                f"with {composition.camera} camera angle",
+            ))
 
         if comp_parts:
-            sentences.append(" ".join(comp_parts))
+            _push_sentence(sentences, " ".join(comp_parts))
 
         # === SENTENCE 7: Core Invariants (Important Style Anchors) ===
         # NOTE: Only include TRUE STYLE invariants, not subject-specific ones
-        if style_profile.core_invariants and len(style_profile.core_invariants) > 0:
+        if style_profile.core_invariants:
             # Filter to only style invariants (skip subject-specific ones)
             style_invariants = []
 
-            # Keywords that indicate subject-specific descriptions (not style)
-            subject_keywords = [
-                "cat", "dog", "person", "human", "animal", "bird", "fish",
-                "facing", "centered", "standing", "sitting", "lying",
-                "positioned", "placed", "located", "foreground", "background",
-                "subject", "figure", "character", "creature",
-                "left", "right", "front", "back", "side view"
-            ]
-
             for invariant in style_profile.core_invariants:
                 invariant_lower = invariant.lower()
 
                 # Check if it's subject-specific
-                is_subject_specific = any(keyword in invariant_lower for keyword in subject_keywords)
+                is_subject_specific = any(keyword in invariant_lower for keyword in _SUBJECT_KEYWORDS)
 
                 if not is_subject_specific:
                     # This is a true style invariant
@@ -531,40 +501,193 @@ Write a single flowing description that embodies ALL the above style rules."""
                 invariant_lower = invariant.lower()
                 prompt_so_far = " ".join(sentences).lower()
                 if invariant_lower not in prompt_so_far:
-                    sentences.append(invariant.capitalize())
+                    _push_sentence(sentences, invariant.capitalize())
 
         # === SENTENCE 8: Training Emphasis (What to emphasize) ===
         # NOTE: Also filter out subject-specific emphasis items
-        if style_rules.emphasize and len(style_rules.emphasize) > 0:
-            # Filter out subject-specific emphasis items
-            subject_keywords = [
-                "cat", "dog", "person", "human", "animal", "bird", "fish",
-                "facing", "centered", "standing", "sitting", "lying",
-                "positioned", "placed", "located", "foreground", "background",
-                "subject", "figure", "character", "creature",
-                "left", "right", "front", "back", "side view",
-                "expression", "face", "eyes", "gaze", "look"
-            ]
-
+        if style_rules.emphasize:
             # Add 1-2 top emphasis items that aren't already mentioned AND aren't subject-specific
             prompt_so_far_lower = " ".join(sentences).lower()
+            # Sentences are stored stripped, so compare against stripped items
+            emphasize_lower = {e.strip().lower() for e in style_rules.emphasize}
             for emphasis in style_rules.emphasize[:5]:  # Check more since we're filtering
                 emphasis_lower = emphasis.lower()
 
                 # Skip if subject-specific
-                is_subject_specific = any(keyword in emphasis_lower for keyword in subject_keywords)
+                is_subject_specific = any(keyword in emphasis_lower for keyword in _EMPHASIS_SUBJECT_KEYWORDS)
                 if is_subject_specific:
                     continue
 
                 # Skip if already mentioned
                 if emphasis_lower not in prompt_so_far_lower:
-                    sentences.append(emphasis.capitalize())
+                    _push_sentence(sentences, emphasis.capitalize())
                     # Only add up to 2 emphasis items
-                    if len([s for s in sentences if s.lower() in [e.lower() for e in style_rules.emphasize]]) >= 2:
+                    if len([s for s in sentences if s.lower() in emphasize_lower]) >= 2:
                         break
 
+    def _mechanical_assembly_deterministic(
+        self,
+        style_profile: StyleProfile,
+        style_rules: StyleRules,
+    ) -> str:
+        """
+        Mechanical assembly specialized for variation_level == 0.
+
+        Always takes the first item and the first phrasing, so no RNG is
+        touched and nothing dispatches through _select_item/_vary_phrasing.
+        """
+        palette = style_profile.palette
+        texture = style_profile.texture
+
+        sentences = []
+
+        # === SENTENCE 1: Style Technique ===
+        opening_parts = []
+        if style_rules.technique_keywords:
+            opening_parts.append(f"Rendered in {style_rules.technique_keywords[0]}")
+        elif texture.surface:
+            opening_parts.append(f"Created with {texture.surface}")
+
+        if style_profile.style_name and style_profile.style_name.lower() not in _GENERIC_STYLE_NAMES:
+            opening_parts.append(f"{style_profile.style_name} style")
+
+        if opening_parts:
+            _push_sentence(sentences, ". ".join(opening_parts))
+
+        # === SENTENCE 2: Color Palette ===
+        if palette.color_descriptions:
+            colors = palette.color_descriptions[:4]
+            if len(colors) == 1:
+                color_desc = f"The color palette features {colors[0]}"
+            elif len(colors) == 2:
+                color_desc = f"The scene features {colors[0]} and {colors[1]} tones"
+            else:
+                color_desc = f"The composition uses {', '.join(colors[:-1])}, and {colors[-1]} tones"
+
+            _push_sentence(sentences, color_desc + self._color_details(palette))
+
+        # === SENTENCE 3: Lighting + Atmosphere ===
+        lighting_parts = self._lighting_parts(style_profile.lighting)
+        if style_rules.mood_keywords:
+            mood = style_rules.mood_keywords[0]
+            if lighting_parts:
+                lighting_parts.append(f"creating {mood}")
+            else:
+                lighting_parts.append(f"The atmosphere features {mood}")
+
+        if lighting_parts:
+            _push_sentence(sentences, ", ".join(lighting_parts))
+
+        self._assemble_structure(sentences, style_profile, style_rules)
+
+        return ". ".join(s[:-1] if s.endswith(".") else s for s in sentences) + "."
+
+    def _mechanical_assembly(
+        self,
+        style_profile: StyleProfile,
+        style_rules: StyleRules,
+        additional_context: str | None = None,
+        variation_level: int = 0,
+    ) -> str:
+        """
+        Mechanical assembly of style traits into a prompt.
+
+        This is the fallback method when LLM-based creative rewriting fails.
+        Builds a prompt by sequentially listing style attributes.
+        """
+        if variation_level == 0:
+            return self._mechanical_assembly_deterministic(style_profile, style_rules)
+
+        palette = style_profile.palette
+        texture = style_profile.texture
+
+        # Build prompt as natural flowing sentences
+        # NOTE: Subject is NOT included - only style information
+        sentences = []
+
+        # === SENTENCE 1: Style Technique ===
+        opening_parts = []
+
+        # Add primary technique - use variation to select
+        if style_rules.technique_keywords:
+            technique = self._select_item(style_rules.technique_keywords, variation_level, index=0)
+            # Vary phrasing
+            phrasing = self._vary_phrasing([
+                f"Rendered in {technique}",
+                f"Created in {technique}",
+                f"Styled as {technique}",
+                f"{technique.capitalize()}"
+            ], variation_level)
+            opening_parts.append(phrasing)
+        elif texture.surface:
+            # Fallback to texture description as technique
+            opening_parts.append(f"Created with {texture.surface}")
+
+        # Add style name if meaningful
+        if style_profile.style_name and style_profile.style_name.lower() not in _GENERIC_STYLE_NAMES:
+            opening_parts.append(f"{style_profile.style_name} style")
+
+        if opening_parts:
+            _push_sentence(sentences, ". ".join(opening_parts))
+
+        # === SENTENCE 2: Color Palette ===
+        pcd = palette.color_descriptions
+        if pcd:
+            # Use variation to select colors (3-5 colors)
+            color_count = 4 if variation_level < 50 else self._rng.randint(3, min(5, len(pcd)))
+            colors = self._select_items(pcd, color_count, variation_level)
+
+            # Build natural color description with varied phrasing
+            if len(colors) == 1:
+                color_desc = self._vary_phrasing([
+                    f"The color palette features {colors[0]}",
+                    f"Dominated by {colors[0]} tones",
+                    f"Features {colors[0]}"
+                ], variation_level)
+            elif len(colors) == 2:
+                color_desc = self._vary_phrasing([
+                    f"The scene features {colors[0]} and {colors[1]} tones",
+                    f"Combines {colors[0]} with {colors[1]}",
+                    f"Features {colors[0]} and {colors[1]} hues"
+                ], variation_level)
+            elif len(colors) >= 3:
+                main_colors = ", ".join(colors[:-1])
+                color_desc = self._vary_phrasing([
+                    f"The composition uses {main_colors}, and {colors[-1]} tones",
+                    f"Features a palette of {main_colors}, and {colors[-1]}",
+                    f"Combines {main_colors} with {colors[-1]} accents"
+                ], variation_level)
+
+            _push_sentence(sentences, color_desc + self._color_details(palette))
+
+        # === SENTENCE 3: Lighting + Atmosphere ===
+        lighting_parts = self._lighting_parts(style_profile.lighting)
+
+        # Add mood keywords - use variation to select
+        if style_rules.mood_keywords:
+            mood = self._select_item(style_rules.mood_keywords, variation_level, index=0)
+            if lighting_parts:
+                mood_phrase = self._vary_phrasing([
+                    f"creating {mood}",
+                    f"evoking {mood}",
+                    f"with {mood}"
+                ], variation_level)
+                lighting_parts.append(mood_phrase)
+            else:
+                mood_phrase = self._vary_phrasing([
+                    f"The atmosphere features {mood}",
+                    f"Atmosphere: {mood}",
+                    f"{mood.capitalize()} mood"
+                ], variation_level)
+                lighting_parts.append(mood_phrase)
+
+        if lighting_parts:
+            _push_sentence(sentences, ", ".join(lighting_parts))
+
+        self._assemble_structure(sentences, style_profile, style_rules)
+
         # Join sentences with proper punctuation
-        return ". ".join(s.strip().rstrip('.') for s in sentences if s.strip()) + "."
+        return ". ".join(s[:-1] if s.endswith(".") else s for s in sentences) + "."
 
     async def write_prompt(
         self,
@@ -575,6 +698,7 @@ Write a single flowing description that embodies ALL the above style rules."""
         include_negative: bool = True,
         variation_level: int = 0,
         use_creative_rewrite: bool = False,  # NEW: default to mechanical assembly
+        include_breakdown: bool = True,
     ) -> PromptWriteResponse:
         """
         Write a styled prompt from a subject and trained style.
@@ -589,6 +713,8 @@ Write a single flowing description that embodies ALL the above style rules."""
                 100 = Maximum variation (random selection, different structures)
             use_creative_rewrite: If True, uses VLM to rewrite (may add embellishments)
                                  If False, uses mechanical assembly (strict to style rules)
+            include_breakdown: If False, skips building prompt_breakdown (left as None)
+                               for callers that only need the prompts
         """
         # Use mechanical assembly by default (more accurate to style)
         if use_creative_rewrite:
@@ -628,66 +754,56 @@ Write a single flowing description that embodies ALL the above style rules."""
         # Build full prompt with subject
         positive_prompt = f"{subject.strip()}. {style_prompt_only}"
 
-        # Build negative prompt
+        # Build negative prompt: forbidden elements, "always avoid" rules,
+        # de-emphasis items, then common quality negatives
         negative_prompt = None
         if include_negative:
-            negative_parts = []
-
-            # Add forbidden elements from style profile
-            if style_profile.motifs.forbidden_elements:
-                negative_parts.extend(style_profile.motifs.forbidden_elements)
-
-            # Add "always avoid" from rules
-            if style_rules.always_avoid:
-                negative_parts.extend(style_rules.always_avoid)
-
-            # Add de-emphasis items
-            if style_rules.de_emphasize:
-                negative_parts.extend(style_rules.de_emphasize)
-
-            # Common quality negatives
-            negative_parts.extend([
-                "blurry", "low quality", "distorted", "deformed"
-            ])
-
+            negative_parts = itertools.chain(
+                style_profile.motifs.forbidden_elements or (),
+                style_rules.always_avoid or (),
+                style_rules.de_emphasize or (),
+                _QUALITY_NEGATIVES,
+            )
             negative_prompt = ", ".join(
                 part for part in negative_parts
-                if part and len(part.strip()) > 0
+                if part and part.strip()
             )
 
         # Build breakdown for transparency
-        palette = style_profile.palette
-        lighting = style_profile.lighting
-        texture = style_profile.texture
-        composition = style_profile.composition
-
-        prompt_breakdown = {
-            "subject": subject,
-            "additional_context": additional_context,
-            "technique": style_rules.technique_keywords if style_rules.technique_keywords else [],
-            "palette": palette.color_descriptions[:5] if palette.color_descriptions else [],
-            "lighting": {
-                "type": lighting.lighting_type,
-                "shadows": lighting.shadows,
-                "highlights": lighting.highlights,
-            },
-            "texture": {
-                "surface": texture.surface,
-                "noise": texture.noise_level,
-                "effects": texture.special_effects,
-            },
-            "composition": {
-                "camera": composition.camera,
-                "framing": composition.framing,
-                "negative_space": composition.negative_space_behavior,
-            },
-            "mood": style_rules.mood_keywords if style_rules.mood_keywords else [],
-            "core_invariants": style_profile.core_invariants,
-            "always_include": style_rules.always_include,
-            "always_avoid": style_rules.always_avoid,
-            "emphasize": style_rules.emphasize,
-            "de_emphasize": style_rules.de_emphasize,
-        }
+        prompt_breakdown = None
+        if include_breakdown:
+            palette = style_profile.palette
+            lighting = style_profile.lighting
+            texture = style_profile.texture
+            composition = style_profile.composition
+
+            prompt_breakdown = PromptBreakdown(
+                subject=subject,
+                additional_context=additional_context,
+                technique=style_rules.technique_keywords or [],
+                palette=palette.color_descriptions[:5] if palette.color_descriptions else [],
+                lighting=PromptBreakdownLighting(
+                    type=lighting.lighting_type,
+                    shadows=lighting.shadows,
+                    highlights=lighting.highlights,
+                ),
+                texture=PromptBreakdownTexture(
+                    surface=texture.surface,
+                    noise=texture.noise_level,
+                    effects=texture.special_effects,
+                ),
+                composition=PromptBreakdownComposition(
+                    camera=composition.camera,
+                    framing=composition.framing,
+                    negative_space=composition.negative_space_behavior,
+                ),
+                mood=style_rules.mood_keywords or [],
+                core_invariants=style_profile.core_invariants,
+                always_include=style_rules.always_include,
+                always_avoid=style_rules.always_avoid,
+                emphasize=style_rules.emphasize,
+                de_emphasize=style_rules.de_emphasize,
+            )
 
         return PromptWriteResponse(
             subject=subject,  # Subject returned separately
@@ -884,90 +1000,75 @@ Write a single flowing description that embodies ALL the above style rules."""
         # ========================================
         # 5. Process iteration history for emphasize/de-emphasize
         # ========================================
+        # Nothing learned yet (e.g. first finalize) - emphasize/de_emphasize keep their defaults
+        if not iteration_history:
+            return rules
+
         emphasize = []
         de_emphasize = []
 
-        if iteration_history:
-            all_lost_traits = []
-            all_preserved_traits = []
-            approved_notes = []
-            rejected_notes = []
-            low_score_dimensions = {}
-            high_score_dimensions = {}
-
-            for iteration in iteration_history:
-                # Collect lost traits (need more emphasis)
-                if iteration.get("lost_traits"):
-                    all_lost_traits.extend(iteration["lost_traits"])
-
-                # Collect preserved traits (working well)
-                if iteration.get("preserved_traits"):
-                    all_preserved_traits.extend(iteration["preserved_traits"])
-
-                # Collect user feedback notes
-                if iteration.get("approved") and iteration.get("notes"):
-                    approved_notes.append(iteration["notes"])
-                elif not iteration.get("approved") and iteration.get("notes"):
-                    rejected_notes.append(iteration["notes"])
-
-                # Track dimension scores
-                if iteration.get("scores"):
-                    for dim, score in iteration["scores"].items():
-                        if dim == "overall":
-                            continue
-                        if dim not in low_score_dimensions:
-                            low_score_dimensions[dim] = []
-                            high_score_dimensions[dim] = []
-                        if score < 60:
-                            low_score_dimensions[dim].append(score)
-                        elif score >= 80:
-                            high_score_dimensions[dim].append(score)
-
-            # Lost traits that appear multiple times need strong emphasis
-            from collections import Counter
-            lost_counts = Counter(all_lost_traits)
-            frequent_lost = [trait for trait, count in lost_counts.most_common(5) if count > 1]
-            emphasize.extend(frequent_lost)
-
-            # Also add any single-occurrence lost traits
-            other_lost = [trait for trait in all_lost_traits if trait not in frequent_lost]
-            emphasize.extend(other_lost[:3])
-
-            # Add approved feedback notes (skip if they're system messages)
-            for note in approved_notes[:2]:
-                # Only add if it's a user note, not a system message
-                if not note.startswith(("PASS", "FAIL", "Weighted")):
-                    emphasize.append(note)
-
-            # De-emphasize: Don't include rejected notes (they're system messages)
-            # Instead, rely on lost_traits which are actual visual elements
-            # rejected_notes contain things like "FAIL: Weighted Δ=-54.0..." which are debug info
-            pass  # Intentionally not adding rejected_notes to de_emphasize
-
-            # Identify consistently weak dimensions
-            weak_dims = []
-            for dim, scores in low_score_dimensions.items():
-                if len(scores) >= 2:  # Consistently low
-                    weak_dims.append(dim)
-
-            # Add dimension-specific emphasis
-            for dim in weak_dims[:3]:
-                if dim == "palette":
-                    emphasize.append("maintain exact color palette")
-                elif dim == "lighting":
-                    emphasize.append("preserve lighting style")
-                elif dim == "texture":
-                    emphasize.append("maintain texture quality")
-                elif dim == "composition":
-                    emphasize.append("follow composition guidelines")
-                elif dim == "line_quality":
-                    emphasize.append("maintain line quality")
-
-            logger.info(f"Training analysis: {len(all_lost_traits)} lost traits, {len(all_preserved_traits)} preserved")
-            logger.info(f"Weak dimensions: {weak_dims}")
-
-        rules.emphasize = list(dict.fromkeys(emphasize))[:8]
-        rules.de_emphasize = list(dict.fromkeys(de_emphasize))[:5]
+        lost_counts = Counter()
+        lost_order = []  # Lost traits in order of first appearance
+        lost_total = 0
+        preserved_total = 0
+        approved_notes = []
+        low_score_counts = defaultdict(int)
+
+        for iteration in iteration_history:
+            # Tally lost traits (need more emphasis)
+            for trait in iteration.get("lost_traits") or ():
+                if trait not in lost_counts:
+                    lost_order.append(trait)
+                lost_counts[trait] += 1
+                lost_total += 1
+
+            # Count preserved traits (working well)
+            preserved_total += len(iteration.get("preserved_traits") or ())
+
+            # Collect user feedback notes from approved iterations
+            if iteration.get("approved") and iteration.get("notes"):
+                approved_notes.append(iteration["notes"])
+
+            # Count low scores per dimension (every dimension is keyed in first-seen order)
+            if iteration.get("scores"):
+                for dim, score in iteration["scores"].items():
+                    if dim == "overall":
+                        continue
+                    low_score_counts[dim] += score < 60
+
+        # Lost traits that appear multiple times need strong emphasis
+        frequent_lost = [trait for trait, count in lost_counts.most_common(5) if count > 1]
+        emphasize.extend(frequent_lost)
+
+        # Also add any single-occurrence lost traits
+        other_lost = [trait for trait in lost_order if trait not in frequent_lost]
+        emphasize.extend(other_lost[:3])
+
+        # Add approved feedback notes (skip if they're system messages)
+        for note in approved_notes[:2]:
+            # Only add if it's a user note, not a system message
+            if not note.startswith(("PASS", "FAIL", "Weighted")):
+                emphasize.append(note)
+
+        # De-emphasize: Don't include rejected notes (they're system messages)
+        # Instead, rely on lost_traits which are actual visual elements
+        # Rejected notes contain things like "FAIL: Weighted Δ=-54.0..." which are debug info,
+        # so they are intentionally not collected or added to de_emphasize
+
+        # Identify consistently weak dimensions
+        weak_dims = []
+        for dim, low_count in low_score_counts.items():
+            if low_count >= 2:  # Consistently low
+                weak_dims.append(dim)
+
+        # Add dimension-specific emphasis
+        emphasize.extend(_DIM_EMPHASIS[dim] for dim in weak_dims[:3] if dim in _DIM_EMPHASIS)
+
+        logger.info(f"Training analysis: {lost_total} lost traits, {preserved_total} preserved")
+        logger.info(f"Weak dimensions: {weak_dims}")
+
+        rules.emphasize = list(itertools.islice(dict.fromkeys(emphasize), 8))
+        rules.de_emphasize = list(itertools.islice(dict.fromkeys(de_emphasize), 5))
 
         return rules
 
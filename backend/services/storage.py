@@ -1,13 +1,181 @@
+import asyncio
 import base64
-import aiofiles
+import binascii
+import errno
+import mmap
+import os
+import shutil
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterator
 
 from backend.config import settings
 
+# Base64 is streamed in blocks so large images are never decoded/encoded in one piece.
+# Encoded block size is a multiple of 4 and raw block size a multiple of 3, so
+# each block decodes/encodes independently.
+_B64_CHUNK = 65536
+_RAW_CHUNK = 49152
+# Deleting the base64 alphabet (and padding) with bytes.translate leaves only
+# the bytes that need a closer look: line breaks, which are dropped, or junk.
+_B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_B64_SPACE = b"\r\n "
+# Large images are written with O_DIRECT (where supported) so write-once
+# artifacts don't evict hot pages such as the VLM model weights. Direct writes
+# go through a page-aligned buffer in multiples of the alignment.
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+_DIRECT_MIN_B64 = (1 << 20) * 4 // 3  # ~1 MB decoded
+_DIRECT_ALIGN = 4096
+_DIRECT_BUF = 1 << 20
+# Most recently loaded images kept base64 encoded, up to this many characters
+_B64_CACHE_BYTES = 128 * (1 << 20)
+
+# MIME type by lowercase file extension
+_MIME = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+_DEFAULT_MIME = "image/png"
+
+
+def _iter_decoded(image_b64: str) -> Iterator[bytes]:
+    """Validate and decode base64 block by block, failing at the first invalid byte.
+
+    Line breaks are dropped, with any partial 4-character group carried into the
+    next block so each decoded block stays aligned.
+    """
+    carry = b""
+    for start in range(0, len(image_b64), _B64_CHUNK):
+        try:
+            block = image_b64[start:start + _B64_CHUNK].encode("ascii")
+        except UnicodeEncodeError as e:
+            raise binascii.Error(f"Invalid base64: non-ASCII character at offset {start + e.start}")
+
+        extra = block.translate(None, _B64_ALPHABET)
+        if extra:
+            invalid = extra.translate(None, _B64_SPACE)
+            if invalid:
+                offset = start + block.index(invalid[:1])
+                raise binascii.Error(f"Invalid base64: unexpected {chr(invalid[0])!r} at offset {offset}")
+            block = block.translate(None, _B64_SPACE)
+
+        data = carry + block
+        cut = len(data) - len(data) % 4
+        carry = data[cut:]
+        yield binascii.a2b_base64(data[:cut] if carry else data)
+
+    if carry:
+        yield binascii.a2b_base64(carry)  # Raises for a truncated final group
+
+
+def _write_all(fd: int, data: memoryview):
+    """Write all of data to fd, failing rather than dropping a short write's tail."""
+    while data:
+        written = os.write(fd, data)
+        if not written:
+            raise OSError(errno.EIO, "Short write: no bytes written")
+        data = data[written:]
+
+
+def _write_b64_direct(file_path: Path, image_b64: str) -> bool:
+    """Decode base64 into a file opened with O_DIRECT.
+
+    Returns False if the filesystem doesn't support direct I/O, leaving the
+    caller to fall back to a buffered write.
+    """
+    try:
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_DIRECT, 0o644)
+    except OSError:
+        return False
+
+    buf = mmap.mmap(-1, _DIRECT_BUF)  # Anonymous maps are page aligned
+    view = memoryview(buf)
+    filled = 0
+    try:
+        for data in _iter_decoded(image_b64):
+            pos = 0
+            while pos < len(data):
+                n = min(len(data) - pos, _DIRECT_BUF - filled)
+                view[filled:filled + n] = data[pos:pos + n]
+                filled += n
+                pos += n
+                if filled == _DIRECT_BUF:
+                    _write_all(fd, view)
+                    filled = 0
+
+        aligned = filled - filled % _DIRECT_ALIGN
+        if aligned:
+            _write_all(fd, view[:aligned])
+        tail = bytes(view[aligned:filled])
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    finally:
+        os.close(fd)
+        view.release()
+        buf.close()
+
+    # The unaligned tail can't go through O_DIRECT; append it normally
+    if tail:
+        with open(file_path, "ab") as f:
+            f.write(tail)
+    return True
+
+
+def _write_b64(file_path: Path, image_b64: str):
+    """Decode base64 block by block into a file.
+
+    Blocks go to a temp file beside the target, which is only replaced once the
+    whole payload decoded, so invalid input never clobbers an existing image.
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        if not (
+            _O_DIRECT
+            and len(image_b64) >= _DIRECT_MIN_B64
+            and _write_b64_direct(tmp_path, image_b64)
+        ):
+            with open(tmp_path, "wb") as f:
+                for block in _iter_decoded(image_b64):
+                    f.write(block)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_b64(file_path: Path) -> str:
+    """Read a file block by block and return it base64 encoded."""
+    encoded = bytearray()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_RAW_CHUNK):
+            encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
+
+def _load_b64(file_path: Path, cached_key: tuple[int, int] | None) -> tuple[tuple[int, int], str | None]:
+    """Stat a file and return its (mtime_ns, size) key with its base64.
+
+    The base64 is None when the key still matches cached_key, so a cache hit
+    skips the read.
+    """
+    st = file_path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if key == cached_key:
+        return key, None
+    return key, _read_b64(file_path)
+
 
 class StorageService:
     def __init__(self):
         self.outputs_dir = settings.ensure_outputs_dir()
+        # path -> ((mtime_ns, size), base64), least recently used first
+        self._b64_cache: OrderedDict[Path, tuple[tuple[int, int], str]] = OrderedDict()
+        self._b64_cache_bytes = 0
 
     def get_session_dir(self, session_id: str) -> Path:
         session_dir = self.outputs_dir / session_id
@@ -25,10 +193,9 @@ class StorageService:
         if "," in image_b64:
             image_b64 = image_b64.split(",", 1)[1]
 
-        image_data = base64.b64decode(image_b64)
-
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(image_data)
+        # Decode and write on a worker thread so the event loop isn't blocked
+        await asyncio.to_thread(_write_b64, file_path, image_b64)
+        self._evict_b64(file_path)
 
         return file_path
 
@@ -36,40 +203,48 @@ class StorageService:
         """Load an image and return as base64."""
         file_path = Path(file_path)
 
-        async with aiofiles.open(file_path, "rb") as f:
-            image_data = await f.read()
-
-        b64 = base64.b64encode(image_data).decode("utf-8")
+        b64 = await self.load_image_raw(file_path)
 
         # Determine mime type from extension
-        suffix = file_path.suffix.lower()
-        mime_types = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        mime_type = mime_types.get(suffix, "image/png")
-
-        return f"data:{mime_type};base64,{b64}"
+        ext = file_path.name.rpartition(".")[2].lower()
+        mime = _MIME.get(ext, _DEFAULT_MIME)
+
+        return f"data:{mime};base64,{b64}"
 
     async def load_image_raw(self, file_path: Path | str) -> str:
         """Load an image and return raw base64 (no data URL prefix)."""
         file_path = Path(file_path)
 
-        async with aiofiles.open(file_path, "rb") as f:
-            image_data = await f.read()
+        # Stat and, unless the cached copy is still current, read and encode on
+        # a worker thread so the event loop isn't blocked
+        cached = self._b64_cache.get(file_path)
+        key, b64 = await asyncio.to_thread(_load_b64, file_path, cached and cached[0])
+        if b64 is None:
+            if self._b64_cache.get(file_path) is cached:  # Not evicted meanwhile
+                self._b64_cache.move_to_end(file_path)
+            return cached[1]
+
+        self._evict_b64(file_path)
+        if len(b64) <= _B64_CACHE_BYTES:
+            self._b64_cache[file_path] = (key, b64)
+            self._b64_cache_bytes += len(b64)
+            while self._b64_cache_bytes > _B64_CACHE_BYTES:
+                _, (_, old) = self._b64_cache.popitem(last=False)
+                self._b64_cache_bytes -= len(old)
+        return b64
 
-        return base64.b64encode(image_data).decode("utf-8")
+    def _evict_b64(self, file_path: Path):
+        """Drop a file's cached base64, if any."""
+        cached = self._b64_cache.pop(file_path, None)
+        if cached is not None:
+            self._b64_cache_bytes -= len(cached[1])
 
-    def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: str) -> bool:
         """Delete all files for a session."""
         session_dir = self.outputs_dir / session_id
         if session_dir.exists():
-            import shutil
-
-            shutil.rmtree(session_dir)
+            # Remove the tree on a worker thread so the event loop isn't blocked
+            await asyncio.to_thread(shutil.rmtree, session_dir)
             return True
         return False
 
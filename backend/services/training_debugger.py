@@ -6,119 +6,213 @@ Creates human-readable debug logs showing:
 - How motifs evolve across iterations
 - Score progression and approval decisions
 - Profile diffs between versions
+
+Log calls only enqueue their data (snapshotting any models passed in); a
+background thread formats and writes the log so request handlers never wait
+on string formatting or disk I/O.
 """
+import atexit
 import json
 import logging
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable, TextIO
 
 from backend.models.schemas import StyleProfile, CritiqueResult
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Log output is buffered per session and the file closed once per iteration
+_LOG_BUFFER_SIZE = 65536
+# Most session logs held open at once; the least recently opened is closed first
+_MAX_OPEN_LOGS = 16
+
+
+def _diff(old: Iterable[str], new: Iterable[str]) -> tuple[frozenset[str], frozenset[str]]:
+    """Return (added, removed) between two collections from a single symmetric difference."""
+    old_set = frozenset(old)
+    new_set = frozenset(new)
+    changed = old_set ^ new_set
+    added = changed & new_set
+    return added, changed - added
+
 
 class TrainingDebugger:
     def __init__(self):
         self.debug_dir = Path(settings.outputs_dir) / "debug_logs"
         self.debug_dir.mkdir(parents=True, exist_ok=True)
+        self._handles: dict[str, TextIO] = {}  # Open log file per session, oldest first (worker thread only)
+
+        # Pending (writer, args) entries, drained by the worker thread
+        self._queue: queue.Queue[tuple[Callable, tuple]] = queue.Queue()
+        self._worker = threading.Thread(target=self._run_worker, name="training-debugger", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _enqueue(self, writer: Callable, *args):
+        """Queue a log entry for the worker thread."""
+        self._queue.put_nowait((writer, args))
+
+    def _run_worker(self):
+        """Format and write queued log entries in order."""
+        while True:
+            writer, args = self._queue.get()
+            try:
+                writer(*args)
+            except Exception as e:
+                logger.warning(f"Training debug log write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued log entry has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write pending entries and close all open session logs."""
+        self.flush()
+        for session_id in list(self._handles):
+            self._close_log(session_id)
 
     def _get_log_path(self, session_id: str) -> Path:
         """Get the debug log file path for a session."""
         return self.debug_dir / f"{session_id}_training.log"
 
-    def _write_section(self, file, title: str, content: str = ""):
-        """Write a formatted section to the log file."""
-        file.write(f"\n{'='*80}\n")
-        file.write(f"{title}\n")
-        file.write(f"{'='*80}\n")
+    def _open_log(self, session_id: str) -> TextIO:
+        """Start a fresh log file for a session and keep it open."""
+        self._close_log(session_id)
+        f = open(self._get_log_path(session_id), 'w', buffering=_LOG_BUFFER_SIZE)
+        self._add_handle(session_id, f)
+        return f
+
+    def _get_handle(self, session_id: str) -> TextIO:
+        """Get the open log file for a session, reopening for append if needed (e.g. after a restart)."""
+        f = self._handles.get(session_id)
+        if f is None:
+            f = open(self._get_log_path(session_id), 'a', buffering=_LOG_BUFFER_SIZE)
+            self._add_handle(session_id, f)
+        return f
+
+    def _add_handle(self, session_id: str, f: TextIO):
+        """Track a session's open log, closing the oldest once too many are open."""
+        # Sessions that error or stop mid-iteration never reach a close point
+        while len(self._handles) >= _MAX_OPEN_LOGS:
+            self._close_log(next(iter(self._handles)))
+        self._handles[session_id] = f
+
+    def _close_log(self, session_id: str):
+        """Flush and close a session's log file if it is open."""
+        f = self._handles.pop(session_id, None)
+        if f is not None:
+            f.close()
+
+    def _format_section(self, title: str, content: str = "") -> str:
+        """Format a section header (and optional content) for the log."""
+        text = f"\n{'='*80}\n{title}\n{'='*80}\n"
         if content:
-            file.write(f"{content}\n")
+            text += f"{content}\n"
+        return text
 
-    def _write_subsection(self, file, title: str, content: str = ""):
-        """Write a formatted subsection to the log file."""
-        file.write(f"\n{'-'*80}\n")
-        file.write(f"{title}\n")
-        file.write(f"{'-'*80}\n")
+    def _format_subsection(self, title: str, content: str = "") -> str:
+        """Format a subsection header (and optional content) for the log."""
+        text = f"\n{'-'*80}\n{title}\n{'-'*80}\n"
         if content:
-            file.write(f"{content}\n")
+            text += f"{content}\n"
+        return text
 
     def log_session_start(self, session_id: str, session_name: str, original_subject: str):
         """Log the start of a training session."""
-        log_path = self._get_log_path(session_id)
-
-        with open(log_path, 'w') as f:
-            self._write_section(f, "TRAINING SESSION STARTED")
-            f.write(f"Session ID: {session_id}\n")
-            f.write(f"Session Name: {session_name}\n")
-            f.write(f"Original Subject: {original_subject}\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._enqueue(self._do_log_session_start, session_id, session_name, original_subject, datetime.now())
+
+    def _do_log_session_start(self, session_id: str, session_name: str, original_subject: str, started: datetime):
+        f = self._open_log(session_id)
+        out = []
+        out.append(self._format_section("TRAINING SESSION STARTED"))
+        out.append(f"Session ID: {session_id}\n")
+        out.append(f"Session Name: {session_name}\n")
+        out.append(f"Original Subject: {original_subject}\n")
+        out.append(f"Started: {started.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("".join(out))
 
     def log_extraction(self, session_id: str, profile: StyleProfile):
         """Log initial style extraction."""
-        log_path = self._get_log_path(session_id)
-
-        with open(log_path, 'a') as f:
-            self._write_section(f, "INITIAL STYLE EXTRACTION (v1)")
-
-            self._write_subsection(f, "Style Name")
-            f.write(f"{profile.style_name}\n")
-
-            self._write_subsection(f, "Core Invariants (Identity Locks)")
-            for i, inv in enumerate(profile.core_invariants, 1):
-                f.write(f"  {i}. {inv}\n")
-
-            self._write_subsection(f, "Color Palette")
-            f.write(f"Saturation: {profile.palette.saturation}\n")
-            f.write(f"Value Range: {profile.palette.value_range}\n")
-            f.write("Colors:\n")
-            for color in profile.palette.color_descriptions:
-                f.write(f"  - {color}\n")
-
-            self._write_subsection(f, "Lighting")
-            f.write(f"Type: {profile.lighting.lighting_type}\n")
-            f.write(f"Shadows: {profile.lighting.shadows}\n")
-            f.write(f"Highlights: {profile.lighting.highlights}\n")
-
-            self._write_subsection(f, "Texture")
-            f.write(f"Surface: {profile.texture.surface}\n")
-            f.write(f"Noise Level: {profile.texture.noise_level}\n")
-            if profile.texture.special_effects:
-                f.write("Special Effects:\n")
-                for effect in profile.texture.special_effects:
-                    f.write(f"  - {effect}\n")
-
-            self._write_subsection(f, "Line & Shape")
-            f.write(f"Line Quality: {profile.line_and_shape.line_quality}\n")
-            f.write(f"Shape Language: {profile.line_and_shape.shape_language}\n")
-            f.write(f"Geometry Notes: {profile.line_and_shape.geometry_notes}\n")
-
-            self._write_subsection(f, "Composition")
-            f.write(f"Camera: {profile.composition.camera}\n")
-            f.write(f"Framing: {profile.composition.framing}\n")
-            f.write(f"Depth: {profile.composition.depth}\n")
-            f.write(f"Negative Space: {profile.composition.negative_space_behavior}\n")
-
-            self._write_subsection(f, "Motifs (Initially Empty)")
-            f.write(f"Recurring Elements: {len(profile.motifs.recurring_elements)}\n")
-            f.write(f"Forbidden Elements: {len(profile.motifs.forbidden_elements)}\n")
+        # Queue a snapshot so later changes to the profile can't leak into the log
+        self._enqueue(self._do_log_extraction, session_id, profile.model_copy(deep=True))
+
+    def _do_log_extraction(self, session_id: str, profile: StyleProfile):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_section("INITIAL STYLE EXTRACTION (v1)"))
+
+        out.append(self._format_subsection("Style Name"))
+        out.append(f"{profile.style_name}\n")
+
+        out.append(self._format_subsection("Core Invariants (Identity Locks)"))
+        for i, inv in enumerate(profile.core_invariants, 1):
+            out.append(f"  {i}. {inv}\n")
+
+        out.append(self._format_subsection("Color Palette"))
+        out.append(f"Saturation: {profile.palette.saturation}\n")
+        out.append(f"Value Range: {profile.palette.value_range}\n")
+        out.append("Colors:\n")
+        for color in profile.palette.color_descriptions:
+            out.append(f"  - {color}\n")
+
+        out.append(self._format_subsection("Lighting"))
+        out.append(f"Type: {profile.lighting.lighting_type}\n")
+        out.append(f"Shadows: {profile.lighting.shadows}\n")
+        out.append(f"Highlights: {profile.lighting.highlights}\n")
+
+        out.append(self._format_subsection("Texture"))
+        out.append(f"Surface: {profile.texture.surface}\n")
+        out.append(f"Noise Level: {profile.texture.noise_level}\n")
+        if profile.texture.special_effects:
+            out.append("Special Effects:\n")
+            for effect in profile.texture.special_effects:
+                out.append(f"  - {effect}\n")
+
+        out.append(self._format_subsection("Line & Shape"))
+        out.append(f"Line Quality: {profile.line_and_shape.line_quality}\n")
+        out.append(f"Shape Language: {profile.line_and_shape.shape_language}\n")
+        out.append(f"Geometry Notes: {profile.line_and_shape.geometry_notes}\n")
+
+        out.append(self._format_subsection("Composition"))
+        out.append(f"Camera: {profile.composition.camera}\n")
+        out.append(f"Framing: {profile.composition.framing}\n")
+        out.append(f"Depth: {profile.composition.depth}\n")
+        out.append(f"Negative Space: {profile.composition.negative_space_behavior}\n")
+
+        out.append(self._format_subsection("Motifs (Initially Empty)"))
+        out.append(f"Recurring Elements: {len(profile.motifs.recurring_elements)}\n")
+        out.append(f"Forbidden Elements: {len(profile.motifs.forbidden_elements)}\n")
+
+        f.write("".join(out))
+        self._close_log(session_id)
 
     def log_iteration_start(self, session_id: str, iteration_num: int, profile_version: int):
         """Log the start of an iteration."""
-        log_path = self._get_log_path(session_id)
+        self._enqueue(self._do_log_iteration_start, session_id, iteration_num, profile_version, datetime.now())
 
-        with open(log_path, 'a') as f:
-            self._write_section(f, f"ITERATION {iteration_num} (Using Profile v{profile_version})")
-            f.write(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    def _do_log_iteration_start(self, session_id: str, iteration_num: int, profile_version: int, started: datetime):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_section(f"ITERATION {iteration_num} (Using Profile v{profile_version})"))
+        out.append(f"Timestamp: {started.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("".join(out))
 
     def log_prompt_generation(self, session_id: str, iteration_num: int, prompt: str):
         """Log the generated image prompt."""
-        log_path = self._get_log_path(session_id)
+        self._enqueue(self._do_log_prompt_generation, session_id, prompt)
 
-        with open(log_path, 'a') as f:
-            self._write_subsection(f, "Generated Image Prompt")
-            f.write(f"{prompt}\n")
+    def _do_log_prompt_generation(self, session_id: str, prompt: str):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_subsection("Generated Image Prompt"))
+        out.append(f"{prompt}\n")
+        f.write("".join(out))
 
     def log_critique(
         self,
@@ -129,30 +223,93 @@ class TrainingDebugger:
         approval_reason: str
     ):
         """Log the critique results and what changed."""
-        log_path = self._get_log_path(session_id)
-
-        with open(log_path, 'a') as f:
-            self._write_subsection(f, "Critique Scores")
-            for dim, score in critique.match_scores.items():
-                f.write(f"  {dim}: {score}/100\n")
-
-            self._write_subsection(f, f"Decision: {'✓ APPROVED' if approved else '✗ REJECTED'}")
-            f.write(f"Reason: {approval_reason}\n")
-
-            if critique.preserved_traits:
-                self._write_subsection(f, "Preserved Traits (Working Well)")
-                for trait in critique.preserved_traits:
-                    f.write(f"  ✓ {trait}\n")
-
-            if critique.lost_traits:
-                self._write_subsection(f, "Lost Traits (Need Emphasis)")
-                for trait in critique.lost_traits:
-                    f.write(f"  ✗ {trait}\n")
-
-            if critique.interesting_mutations:
-                self._write_subsection(f, "Interesting Mutations")
-                for mutation in critique.interesting_mutations:
-                    f.write(f"  → {mutation}\n")
+        self._enqueue(self._do_log_critique, session_id, critique.model_copy(deep=True), approved, approval_reason)
+
+    def _do_log_critique(self, session_id: str, critique: CritiqueResult, approved: bool, approval_reason: str):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_subsection("Critique Scores"))
+        for dim, score in critique.match_scores.items():
+            out.append(f"  {dim}: {score}/100\n")
+
+        out.append(self._format_subsection(f"Decision: {'✓ APPROVED' if approved else '✗ REJECTED'}"))
+        out.append(f"Reason: {approval_reason}\n")
+
+        if critique.preserved_traits:
+            out.append(self._format_subsection("Preserved Traits (Working Well)"))
+            for trait in critique.preserved_traits:
+                out.append(f"  ✓ {trait}\n")
+
+        if critique.lost_traits:
+            out.append(self._format_subsection("Lost Traits (Need Emphasis)"))
+            for trait in critique.lost_traits:
+                out.append(f"  ✗ {trait}\n")
+
+        if critique.interesting_mutations:
+            out.append(self._format_subsection("Interesting Mutations"))
+            for mutation in critique.interesting_mutations:
+                out.append(f"  → {mutation}\n")
+
+        f.write("".join(out))
+
+    def _diff_profiles(self, old_profile: StyleProfile, new_profile: StyleProfile) -> tuple[list[tuple], bool]:
+        """
+        Collect the changes between two profile versions, in log order.
+
+        Returns (entries, significant). Entries are plain sets/strings so they
+        can be formatted later without holding on to the profiles:
+        - ("set", title, added, removed, added_marker, removed_marker)
+        - ("saturation", old, new)
+        - ("value", title, old, new)
+        """
+        entries = []
+        significant = False
+
+        def set_change(title: str, old_items, new_items, added_marker: str = "+", removed_marker: str = "-"):
+            nonlocal significant
+            added, removed = _diff(old_items, new_items)
+            if added or removed:
+                entries.append(("set", title, added, removed, added_marker, removed_marker))
+                significant = True
+
+        def value_change(title: str, old_value, new_value) -> bool:
+            if old_value != new_value:
+                entries.append(("value", title, old_value, new_value))
+                return True
+            return False
+
+        set_change("Core Invariants", old_profile.core_invariants, new_profile.core_invariants)
+        set_change("Color Palette", old_profile.palette.color_descriptions, new_profile.palette.color_descriptions)
+
+        if old_profile.palette.saturation != new_profile.palette.saturation:
+            entries.append(("saturation", old_profile.palette.saturation, new_profile.palette.saturation))
+            significant = True
+
+        if value_change("Lighting Type", old_profile.lighting.lighting_type, new_profile.lighting.lighting_type):
+            significant = True
+        value_change("Highlights", old_profile.lighting.highlights, new_profile.lighting.highlights)
+        value_change("Shadows", old_profile.lighting.shadows, new_profile.lighting.shadows)
+        value_change("Texture Surface", old_profile.texture.surface, new_profile.texture.surface)
+
+        set_change("Special Effects", old_profile.texture.special_effects, new_profile.texture.special_effects)
+
+        value_change("Line Quality", old_profile.line_and_shape.line_quality, new_profile.line_and_shape.line_quality)
+        value_change("Shape Language", old_profile.line_and_shape.shape_language, new_profile.line_and_shape.shape_language)
+        value_change("Framing", old_profile.composition.framing, new_profile.composition.framing)
+
+        # Motifs (IMPORTANT!)
+        set_change(
+            "Recurring Motifs",
+            old_profile.motifs.recurring_elements, new_profile.motifs.recurring_elements,
+            "+ DISCOVERED:", "- REMOVED:",
+        )
+        set_change(
+            "Forbidden Elements",
+            old_profile.motifs.forbidden_elements, new_profile.motifs.forbidden_elements,
+            "+ BANNED:", "- UNBANNED:",
+        )
+
+        return entries, significant
 
     def log_profile_diff(
         self,
@@ -163,146 +320,56 @@ class TrainingDebugger:
         new_version: int
     ):
         """Log the differences between profile versions."""
-        log_path = self._get_log_path(session_id)
-
-        with open(log_path, 'a') as f:
-            self._write_subsection(f, f"Profile Update: v{new_version-1} → v{new_version}")
-
-            # Check core_invariants changes
-            old_inv = set(old_profile.core_invariants)
-            new_inv = set(new_profile.core_invariants)
-            added_inv = new_inv - old_inv
-            removed_inv = old_inv - new_inv
-
-            if added_inv or removed_inv:
-                f.write("\nCore Invariants:\n")
-                if added_inv:
-                    for inv in added_inv:
-                        f.write(f"  + {inv}\n")
-                if removed_inv:
-                    for inv in removed_inv:
-                        f.write(f"  - {inv}\n")
-
-            # Check color changes
-            old_colors = set(old_profile.palette.color_descriptions)
-            new_colors = set(new_profile.palette.color_descriptions)
-            added_colors = new_colors - old_colors
-            removed_colors = old_colors - new_colors
-
-            if added_colors or removed_colors:
-                f.write("\nColor Palette:\n")
-                if added_colors:
-                    for color in added_colors:
-                        f.write(f"  + {color}\n")
-                if removed_colors:
-                    for color in removed_colors:
-                        f.write(f"  - {color}\n")
-
-            # Check saturation changes
-            if old_profile.palette.saturation != new_profile.palette.saturation:
-                f.write(f"\nSaturation: {old_profile.palette.saturation} → {new_profile.palette.saturation}\n")
-
-            # Check lighting changes
-            if old_profile.lighting.lighting_type != new_profile.lighting.lighting_type:
-                f.write(f"\nLighting Type:\n")
-                f.write(f"  OLD: {old_profile.lighting.lighting_type}\n")
-                f.write(f"  NEW: {new_profile.lighting.lighting_type}\n")
-
-            if old_profile.lighting.highlights != new_profile.lighting.highlights:
-                f.write(f"\nHighlights:\n")
-                f.write(f"  OLD: {old_profile.lighting.highlights}\n")
-                f.write(f"  NEW: {new_profile.lighting.highlights}\n")
-
-            if old_profile.lighting.shadows != new_profile.lighting.shadows:
-                f.write(f"\nShadows:\n")
-                f.write(f"  OLD: {old_profile.lighting.shadows}\n")
-                f.write(f"  NEW: {new_profile.lighting.shadows}\n")
-
-            # Check texture changes
-            if old_profile.texture.surface != new_profile.texture.surface:
-                f.write(f"\nTexture Surface:\n")
-                f.write(f"  OLD: {old_profile.texture.surface}\n")
-                f.write(f"  NEW: {new_profile.texture.surface}\n")
-
-            # Check special effects
-            old_effects = set(old_profile.texture.special_effects)
-            new_effects = set(new_profile.texture.special_effects)
-            added_effects = new_effects - old_effects
-            removed_effects = old_effects - new_effects
-
-            if added_effects or removed_effects:
-                f.write("\nSpecial Effects:\n")
-                if added_effects:
-                    for effect in added_effects:
-                        f.write(f"  + {effect}\n")
-                if removed_effects:
-                    for effect in removed_effects:
-                        f.write(f"  - {effect}\n")
-
-            # Check line & shape changes
-            if old_profile.line_and_shape.line_quality != new_profile.line_and_shape.line_quality:
-                f.write(f"\nLine Quality:\n")
-                f.write(f"  OLD: {old_profile.line_and_shape.line_quality}\n")
-                f.write(f"  NEW: {new_profile.line_and_shape.line_quality}\n")
-
-            if old_profile.line_and_shape.shape_language != new_profile.line_and_shape.shape_language:
-                f.write(f"\nShape Language:\n")
-                f.write(f"  OLD: {old_profile.line_and_shape.shape_language}\n")
-                f.write(f"  NEW: {new_profile.line_and_shape.shape_language}\n")
-
-            # Check composition changes
-            if old_profile.composition.framing != new_profile.composition.framing:
-                f.write(f"\nFraming:\n")
-                f.write(f"  OLD: {old_profile.composition.framing}\n")
-                f.write(f"  NEW: {new_profile.composition.framing}\n")
-
-            # Check motifs (IMPORTANT!)
-            old_recurring = set(old_profile.motifs.recurring_elements)
-            new_recurring = set(new_profile.motifs.recurring_elements)
-            added_recurring = new_recurring - old_recurring
-            removed_recurring = old_recurring - new_recurring
-
-            if added_recurring or removed_recurring:
-                f.write("\nRecurring Motifs:\n")
-                if added_recurring:
-                    for motif in added_recurring:
-                        f.write(f"  + DISCOVERED: {motif}\n")
-                if removed_recurring:
-                    for motif in removed_recurring:
-                        f.write(f"  - REMOVED: {motif}\n")
-
-            old_forbidden = set(old_profile.motifs.forbidden_elements)
-            new_forbidden = set(new_profile.motifs.forbidden_elements)
-            added_forbidden = new_forbidden - old_forbidden
-            removed_forbidden = old_forbidden - new_forbidden
-
-            if added_forbidden or removed_forbidden:
-                f.write("\nForbidden Elements:\n")
-                if added_forbidden:
-                    for elem in added_forbidden:
-                        f.write(f"  + BANNED: {elem}\n")
-                if removed_forbidden:
-                    for elem in removed_forbidden:
-                        f.write(f"  - UNBANNED: {elem}\n")
-
-            # If no changes detected
-            if not any([
-                added_inv, removed_inv, added_colors, removed_colors,
-                old_profile.palette.saturation != new_profile.palette.saturation,
-                old_profile.lighting.lighting_type != new_profile.lighting.lighting_type,
-                added_effects, removed_effects, added_recurring, removed_recurring,
-                added_forbidden, removed_forbidden
-            ]):
-                f.write("\nNo significant changes detected in this update.\n")
+        # The diff is taken now so later changes to either profile can't leak into the log
+        entries, significant = self._diff_profiles(old_profile, new_profile)
+        self._enqueue(self._do_log_profile_diff, session_id, new_version, entries, significant)
+
+    def _do_log_profile_diff(self, session_id: str, new_version: int, entries: list[tuple], significant: bool):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_subsection(f"Profile Update: v{new_version-1} → v{new_version}"))
+
+        for kind, *data in entries:
+            if kind == "set":
+                title, added, removed, added_marker, removed_marker = data
+                out.append(f"\n{title}:\n")
+                for item in added:
+                    out.append(f"  {added_marker} {item}\n")
+                for item in removed:
+                    out.append(f"  {removed_marker} {item}\n")
+            elif kind == "saturation":
+                old_value, new_value = data
+                out.append(f"\nSaturation: {old_value} → {new_value}\n")
+            else:
+                title, old_value, new_value = data
+                out.append(f"\n{title}:\n")
+                out.append(f"  OLD: {old_value}\n")
+                out.append(f"  NEW: {new_value}\n")
+
+        # If no changes detected
+        if not significant:
+            out.append("\nNo significant changes detected in this update.\n")
+
+        f.write("".join(out))
+
+        # Profile update ends the iteration
+        self._close_log(session_id)
 
     def log_iteration_rejected(self, session_id: str, iteration_num: int, reason: str):
         """Log when an iteration is rejected and profile is NOT updated."""
-        log_path = self._get_log_path(session_id)
+        self._enqueue(self._do_log_iteration_rejected, session_id, reason)
+
+    def _do_log_iteration_rejected(self, session_id: str, reason: str):
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_subsection("Profile NOT Updated"))
+        out.append(f"Reason: {reason}\n")
+        out.append("Previous profile version retained.\n")
 
-        with open(log_path, 'a') as f:
-            self._write_subsection(f, "Profile NOT Updated")
-            f.write(f"Reason: {reason}\n")
-            f.write("Previous profile version retained.\n")
+        f.write("".join(out))
+
+        # Rejection ends the iteration
+        self._close_log(session_id)
 
     def log_session_complete(
         self,
@@ -313,22 +380,39 @@ class TrainingDebugger:
         final_scores: dict[str, int]
     ):
         """Log the completion of a training session."""
-        log_path = self._get_log_path(session_id)
-
-        with open(log_path, 'a') as f:
-            self._write_section(f, "TRAINING SESSION COMPLETE")
-            f.write(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"\nTotal Iterations: {total_iterations}\n")
-            f.write(f"Approved: {approved_count}/{total_iterations} ({approved_count/total_iterations*100:.1f}%)\n")
-            f.write(f"Final Profile Version: v{final_version}\n")
-
-            f.write(f"\nFinal Scores:\n")
-            for dim, score in final_scores.items():
-                f.write(f"  {dim}: {score}/100\n")
+        self._enqueue(
+            self._do_log_session_complete,
+            session_id, total_iterations, approved_count, final_version, dict(final_scores), datetime.now(),
+        )
 
-            f.write(f"\n{'='*80}\n")
-            f.write(f"Debug log saved to: {log_path}\n")
-            f.write(f"{'='*80}\n")
+    def _do_log_session_complete(
+        self,
+        session_id: str,
+        total_iterations: int,
+        approved_count: int,
+        final_version: int,
+        final_scores: dict[str, int],
+        completed: datetime,
+    ):
+        log_path = self._get_log_path(session_id)
+        f = self._get_handle(session_id)
+        out = []
+        out.append(self._format_section("TRAINING SESSION COMPLETE"))
+        out.append(f"Completed: {completed.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        out.append(f"\nTotal Iterations: {total_iterations}\n")
+        out.append(f"Approved: {approved_count}/{total_iterations} ({approved_count/total_iterations*100:.1f}%)\n")
+        out.append(f"Final Profile Version: v{final_version}\n")
+
+        out.append(f"\nFinal Scores:\n")
+        for dim, score in final_scores.items():
+            out.append(f"  {dim}: {score}/100\n")
+
+        out.append(f"\n{'='*80}\n")
+        out.append(f"Debug log saved to: {log_path}\n")
+        out.append(f"{'='*80}\n")
+
+        f.write("".join(out))
+        self._close_log(session_id)
 
 
 training_debugger = TrainingDebugger()
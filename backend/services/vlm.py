@@ -1,30 +1,193 @@
 import httpx
-import json
+import orjson
 import logging
 import asyncio
-from typing import AsyncIterator
+import random
+import time
+from contextlib import AbstractAsyncContextManager, contextmanager, nullcontext
+from typing import AsyncIterator, Iterator
 
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# How long an /api/tags response is reused by status/health/model checks
+_TAGS_TTL = 2.0
+# Timeout for the shared /api/tags request: the longest any caller uses, so a
+# short-timeout caller that starts the fetch doesn't cut it short for the others
+_TAGS_TIMEOUT = 10.0
+
+# Connection pool sizing for the single Ollama host. /api/chat calls are capped
+# below the pool size so status and health probes always find a free connection.
+_MAX_CONNECTIONS = 64
+_MAX_KEEPALIVE = 32
+_MAX_CHAT_CALLS = 32
+# Image requests hold their whole encoded body (megabytes of base64) while in
+# flight, so fewer of them may be outstanding at once to bound peak memory
+_MAX_IMAGE_CALLS = 8
+
+# Chat payloads are serialized with orjson and sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Upper bound on the retry backoff before jitter, in seconds
+_MAX_BACKOFF = 30.0
+
+# Ollama statuses worth retrying (overload / gateway hiccups); others fail fast
+_RETRIABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class VLMHttpError(RuntimeError):
+    """Non-200 response from Ollama."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed VLM call is worth retrying (network trouble, timeouts, overload)."""
+    if isinstance(error, VLMHttpError):
+        return error.status_code in _RETRIABLE_STATUS
+    return isinstance(error, httpx.TransportError) or isinstance(error.__cause__, httpx.TransportError)
+
+
+# Prompt for describe_image's reverse-prompt extraction
+_DESCRIBE_PROMPT = """Describe this image as if writing a prompt for an AI image generator.
+
+Focus on:
+1. Subject matter and composition
+2. Art style and technique (e.g., digital art, watercolor, photorealistic, anime)
+3. Color palette and mood
+4. Lighting and atmosphere
+5. Any distinctive visual elements or textures
+
+Write a single detailed paragraph (50-100 words) that captures the essence of this image.
+Do NOT start with "This image shows" - write it as a direct image generation prompt.
+Output ONLY the description, no explanation or preamble."""
+
+
+def _strip_data_url(image_b64: str) -> str:
+    """Remove a data URL prefix if present, leaving raw base64.
+
+    Raw base64 can't start with "data:" (':' isn't in the alphabet), so raw
+    images are returned without scanning the payload for a comma.
+    """
+    if image_b64.startswith("data:"):
+        return image_b64.partition(",")[2]
+    return image_b64
+
+
+def _strip_data_urls(images: list[str]) -> list[str]:
+    """Strip data URL prefixes, returning the caller's list untouched when there are none."""
+    if any(img.startswith("data:") for img in images):
+        return [_strip_data_url(img) for img in images]
+    return images
+
+
+def _stream_content(line: bytes | bytearray, loads=orjson.loads) -> str | None:
+    """Return the message content carried by one NDJSON stream line, if any."""
+    # Skip parsing lines that can't carry message content
+    if b'"content"' not in line:
+        return None
+    msg = loads(line).get("message")
+    return msg.get("content") if msg is not None else None
+
 
 class VLMService:
     def __init__(self):
         self.base_url = settings.ollama_url
         self.vlm_model = settings.vlm_model  # Vision model for image analysis
         self.text_model = settings.text_model  # Text model for prompt generation
-        self._active_requests: dict[str, bool] = {}  # Track active requests
+        self.keep_alive = settings.ollama_keep_alive  # None defers to the Ollama server
+        self._active: dict[str, asyncio.Task] = {}  # Request ID -> task running its current attempt
+        self._cancelled: set[str] = set()  # IDs marked for cancellation
+        self._client: httpx.AsyncClient | None = None  # Shared pooled client, created lazily
+        self._tags_cache: tuple[float, dict] | None = None  # (fetched_at, /api/tags JSON)
+        self._tags_task: asyncio.Task | None = None  # In-flight /api/tags fetch, shared by callers
+        self._chat_slots = asyncio.Semaphore(_MAX_CHAT_CALLS)  # Gates in-flight /api/chat calls
+        self._image_slots = asyncio.Semaphore(_MAX_IMAGE_CALLS)  # Gates in-flight image payloads
+        self._backoff_rng = random.Random()  # Retry jitter (replaceable for deterministic runs)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(300.0),
+                # Keep idle connections well past httpx's 5s default: calls to
+                # Ollama are often spaced out by image generation in between
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONNECTIONS,
+                    max_keepalive_connections=_MAX_KEEPALIVE,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    def _image_slot(self, images: list[str] | None) -> AbstractAsyncContextManager:
+        """Slot to hold while an image-bearing request body exists (no-op for text-only calls)."""
+        return self._image_slots if images else nullcontext()
+
+    async def close(self):
+        """Close the shared HTTP client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_tags(self, timeout: float) -> dict | None:
+        """
+        Fetch Ollama's /api/tags, shared by concurrent callers and reused for a
+        short TTL. Returns None on a non-200 response; connection errors raise.
+
+        Concurrent callers await one in-flight request, each with its own timeout.
+        """
+        cached = self._tags_cache
+        if cached is not None and time.monotonic() - cached[0] < _TAGS_TTL:
+            return cached[1]
+
+        task = self._tags_task
+        if task is None or task.done():
+            task = self._tags_task = asyncio.create_task(self._request_tags(max(timeout, _TAGS_TIMEOUT)))
+            # Retrieve the outcome even if every waiter timed out
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    async def _request_tags(self, timeout: float) -> dict | None:
+        """Request /api/tags and cache a successful response."""
+        client = await self._get_client()
+        response = await client.get("/api/tags", timeout=timeout)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        self._tags_cache = (time.monotonic(), data)
+        return data
 
     def cancel_request(self, request_id: str):
         """Mark a request as cancelled."""
-        if request_id in self._active_requests:
-            self._active_requests[request_id] = False
+        call = self._active.get(request_id)
+        if call is not None:
+            self._cancelled.add(request_id)
+            # Abort the in-flight HTTP call so Ollama stops working on it
+            call.cancel("Request cancelled by user")
             logger.info(f"VLM: Request {request_id} marked for cancellation")
 
+    @contextmanager
+    def _track_request(self, request_id: str | None) -> Iterator[None]:
+        """Scope a request's cancellation tracking, cleaning it up on every exit path."""
+        if not request_id:
+            yield
+            return
+
+        self._cancelled.discard(request_id)
+        try:
+            yield
+        finally:
+            self._active.pop(request_id, None)
+            self._cancelled.discard(request_id)
+
     def is_cancelled(self, request_id: str) -> bool:
         """Check if a request has been cancelled."""
-        return self._active_requests.get(request_id) == False
+        return request_id in self._cancelled
 
     async def analyze(
         self,
@@ -52,43 +215,51 @@ class VLMService:
         Returns:
             The model's response text
         """
-        # Track this request if ID provided
-        if request_id:
-            self._active_requests[request_id] = True
-
         # Use specified model or default to vlm_model
         use_model = model or self.vlm_model
 
-        # Retry loop with exponential backoff
+        # Retry loop with exponential backoff and full jitter
         last_error = None
-        for attempt in range(max_retries):
-            try:
-                return await self._do_analyze(
+        with self._track_request(request_id):
+            for attempt in range(max_retries):
+                if request_id and request_id in self._cancelled:
+                    # Cancelled between attempts (e.g. during backoff)
+                    raise asyncio.CancelledError("Request cancelled by user")
+
+                # Each attempt runs as its own task so cancel_request can abort it mid-flight
+                call = asyncio.create_task(self._do_analyze(
                     prompt=prompt,
                     images=images,
                     system=system,
-                    request_id=request_id,
                     timeout=timeout,
                     use_model=use_model,
                     force_json=force_json,
-                )
-            except asyncio.CancelledError:
-                # Don't retry on cancellation
-                raise
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(f"VLM: Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"VLM: All {max_retries} attempts failed")
-                    raise last_error
-            finally:
-                # Clean up request tracking only after all retries exhausted
-                if attempt == max_retries - 1:
-                    if request_id and request_id in self._active_requests:
-                        del self._active_requests[request_id]
+                ))
+                if request_id:
+                    self._active[request_id] = call
+                try:
+                    return await call
+                except asyncio.CancelledError:
+                    # Don't retry on cancellation
+                    raise
+                except Exception as e:
+                    last_error = e
+                    if not _is_transient(e):
+                        # Bad request, bad response, etc. - retrying would fail the same way
+                        raise
+                    if attempt < max_retries - 1:
+                        # Full jitter: uniform in [0, 1s / 2s / 4s ...] so concurrent
+                        # failures don't all retry against Ollama at the same moment
+                        wait_time = self._backoff_rng.uniform(0, min(_MAX_BACKOFF, 2 ** attempt))
+                        logger.warning(f"VLM: Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {wait_time:.1f}s...")
+                        # Track the backoff like an attempt so cancel_request cuts it short
+                        backoff = asyncio.create_task(asyncio.sleep(wait_time))
+                        if request_id:
+                            self._active[request_id] = backoff
+                        await backoff
+                    else:
+                        logger.error(f"VLM: All {max_retries} attempts failed")
+                        raise last_error
 
         # Should never reach here, but just in case
         raise last_error
@@ -98,7 +269,6 @@ class VLMService:
         prompt: str,
         images: list[str] | None,
         system: str | None,
-        request_id: str | None,
         timeout: float,
         use_model: str,
         force_json: bool,
@@ -112,11 +282,7 @@ class VLMService:
 
         user_message = {"role": "user", "content": prompt}
         if images:
-            clean_images = []
-            for img in images:
-                if "," in img:
-                    img = img.split(",", 1)[1]
-                clean_images.append(img)
+            clean_images = _strip_data_urls(images)
             user_message["images"] = clean_images
             logger.info(f"VLM: Sending request with {len(clean_images)} image(s) to {use_model}")
         else:
@@ -129,6 +295,8 @@ class VLMService:
             "messages": messages,
             "stream": False,
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
 
         # Force JSON output for structured tasks (extraction, critique)
         if force_json:
@@ -138,47 +306,45 @@ class VLMService:
         logger.debug(f"VLM: Using model {use_model}")
         logger.debug(f"VLM: Prompt preview: {prompt[:200]}...")
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
+        client = await self._get_client()
+        try:
+            async with self._image_slot(images), self._chat_slots:
                 response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload,
+                    "/api/chat",
+                    content=orjson.dumps(payload),
+                    headers=_JSON_HEADERS,
+                    timeout=timeout,
                 )
 
-                # Check if cancelled
-                if request_id and self.is_cancelled(request_id):
-                    logger.info(f"VLM: Request {request_id} was cancelled")
-                    raise asyncio.CancelledError("Request cancelled by user")
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error(f"VLM HTTP {response.status_code}: {error_text}")
 
-                if response.status_code != 200:
-                    error_text = response.text
-                    logger.error(f"VLM HTTP {response.status_code}: {error_text}")
-
-                    # Try to parse error details
-                    try:
-                        error_json = response.json()
-                        error_msg = error_json.get("error", error_text)
-                    except:
-                        error_msg = error_text
-
-                    raise RuntimeError(f"Ollama error ({response.status_code}): {error_msg}")
-
-                result = response.json()
-                content = result["message"]["content"]
-                logger.info(f"VLM: Response received ({len(content)} chars)")
-                return content
-
-            except httpx.ConnectError as e:
-                logger.error(f"VLM: Cannot connect to Ollama at {self.base_url}: {e}")
-                raise RuntimeError(f"Cannot connect to Ollama at {self.base_url}. Is it running?")
-            except httpx.TimeoutException as e:
-                logger.error(f"VLM: Request timed out after {timeout}s: {e}")
-                raise RuntimeError(f"Ollama request timed out after {int(timeout/60)} minutes. The model may be overloaded.")
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.error(f"VLM: Unexpected error: {type(e).__name__}: {e}")
-                raise
+                # Try to parse error details
+                try:
+                    error_json = response.json()
+                    error_msg = error_json.get("error", error_text)
+                except:
+                    error_msg = error_text
+
+                raise VLMHttpError(response.status_code, f"Ollama error ({response.status_code}): {error_msg}")
+
+            result = orjson.loads(response.content)
+            content = result["message"]["content"]
+            logger.info(f"VLM: Response received ({len(content)} chars)")
+            return content
+
+        except httpx.ConnectError as e:
+            logger.error(f"VLM: Cannot connect to Ollama at {self.base_url}: {e}")
+            raise RuntimeError(f"Cannot connect to Ollama at {self.base_url}. Is it running?") from e
+        except httpx.TimeoutException as e:
+            logger.error(f"VLM: Request timed out after {timeout}s: {e}")
+            raise RuntimeError(f"Ollama request timed out after {int(timeout/60)} minutes. The model may be overloaded.") from e
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"VLM: Unexpected error: {type(e).__name__}: {e}")
+            raise
 
     async def analyze_stream(
         self,
@@ -199,41 +365,53 @@ class VLMService:
 
         user_message = {"role": "user", "content": prompt}
         if images:
-            clean_images = []
-            for img in images:
-                if "," in img:
-                    img = img.split(",", 1)[1]
-                clean_images.append(img)
+            clean_images = _strip_data_urls(images)
             user_message["images"] = clean_images
 
         messages.append(user_message)
 
         payload = {
-            "model": self.model,
+            "model": self.vlm_model,
             "messages": messages,
             "stream": True,
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/chat",
-                    json=payload,
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        logger.error(f"VLM stream error: {error_text}")
-                        raise RuntimeError(f"Ollama stream error: {error_text}")
-
-                    async for line in response.aiter_lines():
-                        if line:
-                            data = json.loads(line)
-                            if "message" in data and "content" in data["message"]:
-                                yield data["message"]["content"]
-            except httpx.ConnectError as e:
-                logger.error(f"VLM: Cannot connect to Ollama: {e}")
-                raise RuntimeError(f"Cannot connect to Ollama at {self.base_url}")
+        client = await self._get_client()
+        try:
+            async with self._image_slot(images), self._chat_slots, client.stream(
+                "POST",
+                "/api/chat",
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=300.0,
+            ) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    logger.error(f"VLM stream error: {error_text}")
+                    raise RuntimeError(f"Ollama stream error: {error_text}")
+
+                # Split NDJSON straight from the raw bytes, reusing one buffer
+                extract = _stream_content  # Local name for the per-line hot loop
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(65536):
+                    buf += chunk
+                    start = 0
+                    while (end := buf.find(b"\n", start)) != -1:
+                        content = extract(buf[start:end])
+                        start = end + 1
+                        if content:
+                            yield content
+                    del buf[:start]
+
+                if buf:
+                    content = extract(buf)
+                    if content:
+                        yield content
+        except httpx.ConnectError as e:
+            logger.error(f"VLM: Cannot connect to Ollama: {e}")
+            raise RuntimeError(f"Cannot connect to Ollama at {self.base_url}")
 
     async def generate_text(
         self,
@@ -274,21 +452,8 @@ class VLMService:
         Returns:
             Natural language description of the image
         """
-        prompt = """Describe this image as if writing a prompt for an AI image generator.
-
-Focus on:
-1. Subject matter and composition
-2. Art style and technique (e.g., digital art, watercolor, photorealistic, anime)
-3. Color palette and mood
-4. Lighting and atmosphere
-5. Any distinctive visual elements or textures
-
-Write a single detailed paragraph (50-100 words) that captures the essence of this image.
-Do NOT start with "This image shows" - write it as a direct image generation prompt.
-Output ONLY the description, no explanation or preamble."""
-
         return await self.analyze(
-            prompt=prompt,
+            prompt=_DESCRIBE_PROMPT,
             images=[image_b64],
             request_id=request_id,
             force_json=False,  # Want natural language, not JSON
@@ -296,13 +461,14 @@ Output ONLY the description, no explanation or preamble."""
 
     def get_active_requests(self) -> list[str]:
         """Get list of active request IDs."""
-        return [k for k, v in self._active_requests.items() if v]
+        return [request_id for request_id in self._active if request_id not in self._cancelled]
 
     def cancel_all_requests(self):
         """Cancel all active requests."""
-        for request_id in list(self._active_requests.keys()):
-            self._active_requests[request_id] = False
-        logger.info(f"VLM: Cancelled {len(self._active_requests)} requests")
+        for request_id, call in self._active.items():
+            self._cancelled.add(request_id)
+            call.cancel("Request cancelled by user")
+        logger.info(f"VLM: Cancelled {len(self._active)} requests")
 
     async def get_status(self) -> dict:
         """Get Ollama status including any running processes."""
@@ -315,19 +481,18 @@ Output ONLY the description, no explanation or preamble."""
         }
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Check if Ollama is responding
-                response = await client.get(f"{self.base_url}/api/tags")
-                status["connected"] = response.status_code == 200
+            # Check if Ollama is responding
+            status["connected"] = await self._fetch_tags(timeout=5.0) is not None
 
-                # Check for running processes (Ollama ps endpoint)
-                try:
-                    ps_response = await client.get(f"{self.base_url}/api/ps")
-                    if ps_response.status_code == 200:
-                        ps_data = ps_response.json()
-                        status["ollama_running"] = ps_data.get("models", [])
-                except:
-                    pass
+            # Check for running processes (Ollama ps endpoint)
+            try:
+                client = await self._get_client()
+                ps_response = await client.get("/api/ps", timeout=5.0)
+                if ps_response.status_code == 200:
+                    ps_data = ps_response.json()
+                    status["ollama_running"] = ps_data.get("models", [])
+            except:
+                pass
 
         except Exception as e:
             logger.warning(f"VLM status check failed: {e}")
@@ -337,20 +502,18 @@ Output ONLY the description, no explanation or preamble."""
     async def health_check(self) -> bool:
         """Check if Ollama is available."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    # Check if our models are available
-                    data = response.json()
-                    models = [m.get("name", "") for m in data.get("models", [])]
-                    vlm_available = any(self.vlm_model in m for m in models)
-                    text_available = any(self.text_model in m for m in models)
-                    if not vlm_available:
-                        logger.warning(f"VLM: Vision model '{self.vlm_model}' not found. Available: {models}")
-                    if not text_available:
-                        logger.warning(f"VLM: Text model '{self.text_model}' not found. Available: {models}")
-                    return True
-                return False
+            data = await self._fetch_tags(timeout=10.0)
+            if data is not None:
+                # Check if our models are available
+                models = [m.get("name", "") for m in data.get("models", [])]
+                vlm_available = any(self.vlm_model in m for m in models)
+                text_available = any(self.text_model in m for m in models)
+                if not vlm_available:
+                    logger.warning(f"VLM: Vision model '{self.vlm_model}' not found. Available: {models}")
+                if not text_available:
+                    logger.warning(f"VLM: Text model '{self.text_model}' not found. Available: {models}")
+                return True
+            return False
         except Exception as e:
             logger.warning(f"VLM health check failed: {e}")
             return False
@@ -358,31 +521,29 @@ Output ONLY the description, no explanation or preamble."""
     async def check_model(self) -> dict:
         """Check if the configured models are available and return info."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    models = data.get("models", [])
-                    model_names = [m.get("name", "") for m in models]
-
-                    vlm_found = None
-                    text_found = None
-                    for m in models:
-                        name = m.get("name", "")
-                        if self.vlm_model in name:
-                            vlm_found = m
-                        if self.text_model in name:
-                            text_found = m
-
-                    return {
-                        "vlm_model": self.vlm_model,
-                        "vlm_model_found": vlm_found is not None,
-                        "vlm_model_info": vlm_found,
-                        "text_model": self.text_model,
-                        "text_model_found": text_found is not None,
-                        "text_model_info": text_found,
-                        "available_models": model_names,
-                    }
+            data = await self._fetch_tags(timeout=10.0)
+            if data is not None:
+                models = data.get("models", [])
+                model_names = [m.get("name", "") for m in models]
+
+                vlm_found = None
+                text_found = None
+                for m in models:
+                    name = m.get("name", "")
+                    if self.vlm_model in name:
+                        vlm_found = m
+                    if self.text_model in name:
+                        text_found = m
+
+                return {
+                    "vlm_model": self.vlm_model,
+                    "vlm_model_found": vlm_found is not None,
+                    "vlm_model_info": vlm_found,
+                    "text_model": self.text_model,
+                    "text_model_found": text_found is not None,
+                    "text_model_info": text_found,
+                    "available_models": model_names,
+                }
         except Exception as e:
             return {
                 "vlm_model": self.vlm_model,
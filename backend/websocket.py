@@ -1,19 +1,27 @@
 import json
 import asyncio
 import time
-from typing import Dict, Set
+from typing import Dict
+from weakref import WeakSet
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
+# Heartbeat frames, as sent by the frontend (JSON.stringify({type: "ping"})),
+# are answered without parsing
+_PING = '{"type":"ping"}'
+_PONG = json.dumps({"event": "pong"})
+
 
 class ConnectionManager:
     def __init__(self):
-        # Maps session_id -> set of websocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Maps session_id -> set of websocket connections. Weak, so sockets whose
+        # handler ended without disconnect() (e.g. cancelled on shutdown) drop out
+        self.active_connections: Dict[str, WeakSet[WebSocket]] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         if session_id not in self.active_connections:
-            self.active_connections[session_id] = set()
+            self.active_connections[session_id] = WeakSet()
         self.active_connections[session_id].add(websocket)
 
     def disconnect(self, websocket: WebSocket, session_id: str):
@@ -24,21 +32,28 @@ class ConnectionManager:
 
     async def send_to_session(self, session_id: str, event: str, data: dict = None):
         """Send a message to all connections for a session."""
-        if session_id not in self.active_connections:
+        connections = list(self.active_connections.get(session_id, ()))
+        if not connections:
+            # Every viewer is gone (possibly collected); drop the empty entry
+            self.active_connections.pop(session_id, None)
             return
 
-        message = json.dumps({"event": event, "data": data})
-        dead_connections = set()
+        # Encoded once and shared by every viewer; text frames so clients can JSON.parse directly
+        message = orjson.dumps({"event": event, "data": data}, option=orjson.OPT_NON_STR_KEYS).decode()
 
-        for connection in self.active_connections[session_id]:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                dead_connections.add(connection)
+        # Send to all viewers concurrently so one slow socket doesn't hold up the rest.
+        # The snapshot above keeps them alive and stable while sends are in flight.
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True,
+        )
 
         # Clean up dead connections
-        for conn in dead_connections:
-            self.active_connections[session_id].discard(conn)
+        live = self.active_connections.get(session_id)
+        if live is not None:
+            for conn, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    live.discard(conn)
 
     async def broadcast_progress(
         self,
@@ -105,10 +120,14 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         while True:
             # Keep connection alive, wait for messages
             data = await websocket.receive_text()
+            if data == _PING:
+                await websocket.send_text(_PONG)
+                continue
+
             # Could handle client messages here if needed
             message = json.loads(data)
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"event": "pong"}))
+                await websocket.send_text(_PONG)
     except WebSocketDisconnect:
         manager.disconnect(websocket, session_id)
     except Exception: